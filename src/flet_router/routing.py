@@ -1,22 +1,39 @@
 import abc
+import asyncio
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass
 import inspect
 from enum import Enum
+from functools import lru_cache
 import re
+import sys
+from weakref import WeakKeyDictionary
 from typing import (
     Any,
     Callable,
     Coroutine,
+    DefaultDict,
+    Dict,
     List,
+    Mapping,
+    Match,
     Optional,
+    Pattern,
+    Sequence,
     Tuple,
     Type,
     Union,
     cast,
 )
-from urllib.parse import parse_qs, urlencode
+from urllib.parse import parse_qs, quote_plus, urlencode
 import flet as ft
 
+# "{name}" placeholder in a route path
+_PARAM_PATTERN = re.compile(r"{([^/]+)}")
+
+# dataclass(slots=True) is only available from Python 3.10
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class RouteView(abc.ABC):
 
@@ -24,16 +41,52 @@ class RouteView(abc.ABC):
     async def build(*args, **kwargs) -> ft.View:
         raise NotImplementedError
 
-    @abc.abstractmethod
     async def before_enter(*args, **kwargs):
         pass
 
-    @abc.abstractmethod
     async def before_leave(*args, **kwargs):
         pass
 
 
-@dataclass
+def _view_hook(view: RouteView, name: str) -> Optional[Callable]:
+    # hooks left as the RouteView no-op are skipped instead of awaited
+    if getattr(type(view), name) is getattr(RouteView, name):
+        return None
+    return getattr(view, name)
+
+
+class _PathParams(dict):
+    """
+    format_map mapping that leaves unknown placeholders untouched.
+    """
+
+    def __missing__(self, key: str) -> str:
+        return f"{{{key}}}"
+
+
+def _quote(value: Any) -> str:
+    return quote_plus(value if isinstance(value, bytes) else str(value))
+
+
+def _encode_query(query: Any) -> str:
+    # same output as urlencode, without its generic sequence handling
+    if not isinstance(query, dict) or len(query) > 3:
+        return urlencode(query)
+    return "&".join(f"{_quote(key)}={_quote(value)}" for key, value in query.items())
+
+
+def _format_path(route_path: str, params: dict) -> str:
+    path_params = _PathParams((key, str(value)) for key, value in params.items())
+    try:
+        return route_path.format_map(path_params)
+    except ValueError:
+        # stray braces in the path, substitute placeholders one by one
+        for key, value in path_params.items():
+            route_path = route_path.replace(f"{{{key}}}", value)
+        return route_path
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Location:
     name: Union[str, Enum]
     params: Optional[dict] = None
@@ -41,11 +94,9 @@ class Location:
 
     def build_path(self, route_path: str) -> str:
         if self.params:
-            for key, value in self.params.items():
-                route_path = route_path.replace(f"{{{key}}}", str(value))
+            route_path = _format_path(route_path, self.params)
         if self.query:
-            query_string = urlencode(self.query)
-            route_path = f"{route_path}?{query_string}"
+            route_path = f"{route_path}?{_encode_query(self.query)}"
         return route_path
 
 
@@ -59,67 +110,338 @@ MiddlewareResponse = Union[None, bool, RoutePath]
 
 MiddlewareHandler = Callable[..., Coroutine[Any, Any, MiddlewareResponse]]
 
+_MiddlewareCall = Callable[
+    ["Route", Optional["Route"], "Router", Optional[ft.Page]],
+    Coroutine[Any, Any, MiddlewareResponse],
+]
+
+_signature_cache: "WeakKeyDictionary[Callable, Mapping[str, inspect.Parameter]]" = (
+    WeakKeyDictionary()
+)
+# bound methods are created on every attribute access and their signature
+# has no self, so they are cached separately, keyed on the function
+_method_signature_cache: (
+    "WeakKeyDictionary[Callable, Mapping[str, inspect.Parameter]]"
+) = WeakKeyDictionary()
+
+
+def _signature_params(func: Callable) -> Mapping[str, inspect.Parameter]:
+    """
+    inspect.signature(func).parameters, computed once per function. Routes
+    are rebuilt by include_router, which would otherwise inspect the same
+    handlers and middlewares again.
+    """
+    key = getattr(func, "__func__", None)
+    if key is not None:
+        cache = _method_signature_cache
+    else:
+        key, cache = func, _signature_cache
+
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # not weak-referenceable
+        return inspect.signature(func).parameters
+
+    params = inspect.signature(func).parameters
+    cache[key] = params
+    return params
+
+
+def _wrap_middleware(middleware: MiddlewareHandler) -> _MiddlewareCall:
+    """
+    Bind the middleware calling convention once, so a navigation does not
+    need to inspect which of to_route/from_route/router/page it accepts.
+    """
+    handler_params = _signature_params(middleware)
+    wants_to_route = "to_route" in handler_params
+    wants_from_route = "from_route" in handler_params
+    wants_router = "router" in handler_params
+    wants_page = "page" in handler_params
+
+    if not (wants_to_route or wants_from_route or wants_router or wants_page):
+
+        def call_bare(to_route, from_route, router, page):
+            return middleware()
+
+        return call_bare
+
+    def call(to_route, from_route, router, page):
+        kwargs = {}
+        if wants_to_route:
+            kwargs["to_route"] = to_route
+        if wants_from_route:
+            kwargs["from_route"] = from_route
+        if wants_router:
+            kwargs["router"] = router
+        if wants_page:
+            kwargs["page"] = page
+        return middleware(**kwargs)
+
+    return call
+
+
+def _keep(value: Any) -> Any:
+    return value
+
+
+def _param_converter(annotation: Any) -> Callable[[Any], Any]:
+    """
+    Build the function turning a raw path or query value into the type a
+    handler parameter is annotated with.
+    """
+    if annotation is inspect.Parameter.empty:
+        return _keep
+
+    # query values are lists, unwrap single values unless a list is wanted
+    unwrap = getattr(annotation, "__origin__", None) is not list
+
+    def convert(value: Any) -> Any:
+        raw = value
+        if unwrap and isinstance(value, list) and len(value) == 1:
+            value = value[0]
+        try:
+            return annotation(value)
+        except ValueError:
+            raise TypeError(f"Cannot convert {raw} to {annotation}")
+
+    return convert
+
+
+def _kwargs_builder(handler_params: Mapping[str, inspect.Parameter]):
+    """
+    Specialize the kwargs construction for one handler signature, so the
+    per-navigation work is a loop over precomputed fields.
+    """
+    wants_page = "page" in handler_params
+    wants_router = "router" in handler_params
+    converters = tuple(
+        (name, _param_converter(param.annotation))
+        for name, param in handler_params.items()
+    )
+
+    def build_kwargs(path_params: dict, page: ft.Page, router: "Router") -> dict:
+        kwargs = {}
+        if wants_page:
+            kwargs["page"] = page
+        if wants_router:
+            kwargs["router"] = router
+
+        for key, convert in converters:
+            if key in path_params:
+                kwargs[key] = convert(path_params[key])
+
+        return kwargs
+
+    return build_kwargs
+
+
+@lru_cache(maxsize=256)
+def _compile_path(path: str) -> Pattern[str]:
+    # include_router rebuilds routes for paths compiled before
+    return re.compile("^" + _path_regex(path) + "$")
+
+
+def _path_regex(path: str, group_name: Callable[[str], str] = _keep) -> str:
+    """
+    Translate a route path into a regex, segment by segment. Literal text is
+    escaped so that only {name} placeholders are special; group_name maps a
+    placeholder to its regex group name.
+    """
+    parts = []
+    for segment in path.split("/"):
+        if "{" not in segment and "}" not in segment:
+            parts.append(re.escape(segment))
+        elif (
+            segment.startswith("{")
+            and segment.endswith("}")
+            and segment.count("{") == 1
+            and segment.count("}") == 1
+        ):
+            parts.append(f"(?P<{group_name(segment[1:-1])}>[^/]+)")
+        else:
+            # "{name}.txt" splits into ["", "name", ".txt"], names at odd indexes
+            pieces = _PARAM_PATTERN.split(segment)
+            parts.append(
+                "".join(
+                    f"(?P<{group_name(piece)}>[^/]+)" if index % 2 else re.escape(piece)
+                    for index, piece in enumerate(pieces)
+                )
+            )
+    return "/".join(parts)
+
+
+def _copy_params(params: Optional[dict]) -> Optional[dict]:
+    return None if params is None else dict(params)
+
+
+def _split_path(path: str) -> Tuple[str, str]:
+    path_only, _, query_string = path.partition("?")
+    return path_only, query_string
+
+
+def _split_segments(path: str) -> Optional[Tuple[Tuple[bool, str], ...]]:
+    """
+    Split a route path into (is_param, literal_or_name) segments. Returns None
+    when a segment mixes text and placeholders, e.g. "{name}.txt", since such
+    paths can only be matched by the regex. A leading "/" is not a segment.
+    """
+    if path.startswith("/"):
+        path = path[1:]
+    segments = []
+    for segment in path.split("/"):
+        if segment.startswith("{") and segment.endswith("}"):
+            name = segment[1:-1]
+            if not name or "{" in name or "}" in name:
+                return None
+            segments.append((True, name))
+        elif "{" in segment or "}" in segment:
+            return None
+        else:
+            segments.append((False, segment))
+    return tuple(segments)
+
+
+_MatchFunc = Callable[[str], Optional[Match[str]]]
+
 
 class Route:
+    __slots__ = (
+        "handler",
+        "name",
+        "path",
+        "middlewares",
+        "has_middleware",
+        "is_static",
+        "handler_params",
+        "_pattern",
+        "_build",
+        "_before_enter",
+        "_before_leave",
+        "_build_kwargs",
+        "_before_enter_kwargs",
+        "_before_leave_kwargs",
+        "_middlewares",
+        "_segments",
+        "_match",
+    )
+
     def __init__(
         self,
         handler: RouteHandler,
         name: Union[str, Enum],
         path: str,
-        middlewares: List[MiddlewareHandler],
+        middlewares: Sequence[MiddlewareHandler],
     ):
         self.handler = handler
         self.name = name
         self.path = path
-        self.middlewares = middlewares
+        self.middlewares = tuple(middlewares)
+        self.has_middleware = bool(self.middlewares)
 
         self._before_enter = None
         self._before_leave = None
 
-        if (
-            inspect.isclass(self.handler)
-            and not isinstance(self.handler, RouteView)
-            and issubclass(self.handler, RouteView)
-        ):
+        if isinstance(self.handler, type) and issubclass(self.handler, RouteView):
             # initialize handler class
             self.handler = self.handler()
 
-        if inspect.isfunction(self.handler):
-            self._build = self.handler
-        elif isinstance(self.handler, RouteView):
-            _build: Optional[RouteCallableHandler] = getattr(
-                self.handler, "build", None
+        if isinstance(self.handler, RouteView):
+            self._build = self.handler.build
+            self._before_enter = _view_hook(self.handler, "before_enter")
+            self._before_leave = _view_hook(self.handler, "before_leave")
+        elif isinstance(self.handler, type):
+            # classes are callable, only RouteView subclasses are handlers
+            raise ValueError(
+                f"Invalid handler type in route {self.name}: {self.handler}"
             )
-            if _build is None:
-                raise ValueError(
-                    f"Class {self.handler.__name__} must implement a build method"
-                )
-            self._build = _build
-            self._before_enter = getattr(self.handler, "before_enter", None)
-            self._before_leave = getattr(self.handler, "before_leave", None)
+        elif callable(self.handler):
+            self._build = self.handler
         else:
             raise ValueError(
                 f"Invalid handler type in route {self.name}: {self.handler}"
             )
 
-        patter_path = re.sub(r"{([^/]+)}", r"(?P<\1>[^/]+)", path)
-        try:
-            self.pattern = re.compile("^" + patter_path + "$")
-        except re.error as e:
-            raise ValueError(f"Invalid path pattern: {path}")
+        self.handler_params = _signature_params(self._build)
+        self._build_kwargs = _kwargs_builder(self.handler_params)
+        self._before_enter_kwargs = (
+            _kwargs_builder(_signature_params(self._before_enter))
+            if self._before_enter is not None
+            else None
+        )
+        self._before_leave_kwargs = (
+            _kwargs_builder(_signature_params(self._before_leave))
+            if self._before_leave is not None
+            else None
+        )
+        self._middlewares = tuple(
+            _wrap_middleware(middleware) for middleware in self.middlewares
+        )
+
+        self._segments = _split_segments(path)
+        self.is_static = "{" not in path
+
+        # the segment walk does not need the regex, only compile it eagerly
+        # for routes matched by it, which also rejects invalid paths
+        self._pattern: Optional[Pattern[str]] = None
+        self._match: Optional[_MatchFunc] = None
+        if self._segments is None:
+            self._match = self.pattern.match
+        else:
+            names = [value for is_param, value in self._segments if is_param]
+            if len(set(names)) != len(names) or not all(
+                name.isidentifier() for name in names
+            ):
+                raise ValueError(f"Invalid path pattern: {path}")
+
+    @property
+    def pattern(self) -> Pattern[str]:
+        if self._pattern is None:
+            try:
+                self._pattern = _compile_path(self.path)
+            except re.error:
+                raise ValueError(f"Invalid path pattern: {self.path}")
+        return self._pattern
+
+    def _match_segments(self, path_only: str) -> Optional[dict]:
+        """
+        Match a path without query against the route segments, returning the
+        captured params or None when the path does not match.
+        """
+        segments = cast(Tuple[Tuple[bool, str], ...], self._segments)
+
+        # relative route paths only match relative paths, and the other way round
+        absolute = path_only.startswith("/")
+        if absolute != self.path.startswith("/"):
+            return None
+        parts = (path_only[1:] if absolute else path_only).split("/")
+        if len(parts) != len(segments):
+            return None
 
-    def extract_params(self, path: str) -> dict:
         params = {}
+        for part, (is_param, value) in zip(parts, segments):
+            if is_param:
+                if not part:
+                    return None
+                params[value] = part
+            elif part != value:
+                return None
+        return params
 
-        path_only = path
-        query_string = ""
+    def extract_params(self, path: str, path_params: Optional[dict] = None) -> dict:
+        params = {}
 
-        if "?" in path:
-            path_only, query_string = path.split("?")
+        path_only, query_string = _split_path(path)
 
-        match = re.match(self.pattern, path_only)
-        if match:
-            path_params = match.groupdict()
+        if path_params is None:
+            if self._segments is not None:
+                path_params = self._match_segments(path_only)
+            else:
+                match = cast(_MatchFunc, self._match)(path_only)
+                path_params = match.groupdict() if match else None
+        if path_params:
             params.update(path_params)
 
         if query_string:
@@ -129,71 +451,68 @@ class Route:
         return params
 
     def match(self, path: str):
-        only_path = path.split("?")[0]
-        return bool(re.match(self.pattern, only_path))
-
-    def _prepare_kwargs(self, func, path, page, router):
+        only_path, _ = _split_path(path)
+        if self._segments is not None:
+            return self._match_segments(only_path) is not None
+        return cast(_MatchFunc, self._match)(only_path) is not None
 
-        handler_params = inspect.signature(func).parameters
-
-        kwargs = {}
-        if "page" in handler_params:
-            kwargs["page"] = page
-        if "router" in handler_params:
-            kwargs["router"] = router
-
-        path_params = self.extract_params(path)
-
-        for key, param in handler_params.items():
-            if key not in path_params:
-                continue
-
-            value = path_params[key]
-
-            if param.annotation == inspect.Parameter.empty:
-                kwargs[key] = value
-                continue
-
-            if (
-                (not getattr(param.annotation, "__origin__", None) is list)
-                and isinstance(value, list)
-                and len(value) == 1
-            ):
-                value = value[0]
-
-            try:
-                kwargs[key] = param.annotation(value)
-            except ValueError:
-                raise TypeError(
-                    f"Cannot convert {path_params[key]} to {param.annotation}"
-                )
-
-        return kwargs
+    async def _enter(self, params: dict, page: ft.Page, router: "Router") -> ft.View:
+        """
+        Run before_enter and then build with params that were already
+        extracted, so a navigation extracts them once for both handlers.
+        """
+        if self._before_enter is not None:
+            await self._before_enter(**self._before_enter_kwargs(params, page, router))
+        view: ft.View = await self._build(**self._build_kwargs(params, page, router))
+        return view
 
-    async def before_leave(self, path: str, page: ft.Page, router: "Router"):
+    async def before_leave(
+        self,
+        path: str,
+        page: ft.Page,
+        router: "Router",
+        path_params: Optional[dict] = None,
+    ):
         if self._before_leave is None:
             return
 
-        kwargs = self._prepare_kwargs(self._before_leave, path, page, router)
-        await self._before_leave(**kwargs)
+        params = self.extract_params(path, path_params)
+        await self._before_leave(**self._before_leave_kwargs(params, page, router))
 
-    async def before_enter(self, path: str, page: ft.Page, router: "Router"):
+    async def before_enter(
+        self,
+        path: str,
+        page: ft.Page,
+        router: "Router",
+        path_params: Optional[dict] = None,
+    ):
         if self._before_enter is None:
             return
 
-        kwargs = self._prepare_kwargs(self._before_enter, path, page, router)
-        await self._before_enter(**kwargs)
+        params = self.extract_params(path, path_params)
+        await self._before_enter(**self._before_enter_kwargs(params, page, router))
 
     async def view(
         self,
         path: str,
         page: ft.Page,
         router: "Router",
+        path_params: Optional[dict] = None,
     ) -> ft.View:
-        kwargs = self._prepare_kwargs(self._build, path, page, router)
-        view: ft.View = await self._build(**kwargs)
+        params = self.extract_params(path, path_params)
+        view: ft.View = await self._build(**self._build_kwargs(params, page, router))
         return view
 
+    def build_path(
+        self, params: Optional[dict] = None, query: Optional[dict] = None
+    ) -> str:
+        path = self.path
+        if params and not self.is_static:
+            path = _format_path(path, params)
+        if query:
+            path = f"{path}?{_encode_query(query)}"
+        return path
+
     def __str__(self) -> str:
         return f"FletRoute({self.name}, {self.path})"
 
@@ -201,35 +520,136 @@ class Route:
         return str(self)
 
 
+# combined pattern group -> (route, ((param name, group name), ...))
+_FallbackGroups = Dict[str, Tuple[Route, Tuple[Tuple[str, str], ...]]]
+
+
+def _not_found_view(page: ft.Page) -> ft.View:
+    bgcolor = page.bgcolor
+    return ft.View(
+        bgcolor=bgcolor if isinstance(bgcolor, str) else f"{bgcolor}",
+    )
+
+
+class _TrieNode:
+    """
+    Node of the segment trie used by Router to look up string paths.
+    """
+
+    __slots__ = ("static", "param", "route", "param_names", "order", "min_order")
+
+    def __init__(self):
+        self.static: Dict[str, "_TrieNode"] = {}
+        self.param: Optional["_TrieNode"] = None
+        self.route: Optional[Route] = None
+        self.param_names: Tuple[str, ...] = ()
+        # registration index of route, and the lowest one in this subtree
+        self.order = sys.maxsize
+        self.min_order = sys.maxsize
+
+
 class Router:
+    __slots__ = (
+        "prefix",
+        "middlewares",
+        "page",
+        "back_middlewares",
+        "routes",
+        "history",
+        "current_path",
+        "current_route",
+        "_current_params",
+        "_update_pending",
+        "_trie",
+        "_fallback_routes",
+        "_fallback_patterns",
+        "_static",
+        "_by_name",
+        "_route_order",
+        "_resolve_cache",
+        "_not_found_view_factory",
+    )
+
+    _RESOLVE_CACHE_MAX = 256
 
     def __init__(
         self,
         prefix: str = "",
         middlewares: Optional[list] = None,
         page: Optional[ft.Page] = None,
+        back_middlewares: bool = True,
     ):
         self.prefix = prefix
         self.middlewares = middlewares
         self.page = page
+        # run route middlewares again when going back to a history entry
+        self.back_middlewares = back_middlewares
 
         self.routes: list[Route] = []
-        self.history: list[str] = []
+        self.history: List[Tuple[Optional[Route], str, Optional[dict]]] = []
         self.current_path: Optional[str] = None
         self.current_route: Optional[Route] = None
+        self._current_params: Optional[dict] = None
 
-    def _create_url_path(self, *segments: str):
-        return "/" + "/".join(
-            segment.strip("/") for segment in segments if segment.strip("/")
+        self._update_pending = False
+
+        self._trie = _TrieNode()
+        # regex-only routes bucketed by the number of "/" in their path
+        self._fallback_routes: DefaultDict[int, List[Route]] = defaultdict(list)
+        self._fallback_patterns: Dict[int, Tuple[_MatchFunc, _FallbackGroups]] = {}
+        self._static: Dict[str, Route] = {}
+        self._by_name: Dict[Union[str, Enum], Route] = {}
+        # registration index of each route, the first registered match wins
+        self._route_order: Dict[Route, int] = {}
+
+        self._resolve_cache: "OrderedDict[str, Tuple[Route, str, Optional[dict]]]" = (
+            OrderedDict()
         )
+        # builds the view shown when no route matches, takes the page
+        self._not_found_view_factory: Callable[[ft.Page], ft.View] = _not_found_view
+
+    def _create_url_path(self, *segments: str):
+        stripped = (segment.strip("/") for segment in segments)
+        return "/" + "/".join(segment for segment in stripped if segment)
 
     def add_route(
         self,
         handler: RouteHandler,
         name: Union[str, Enum],
         path: str,
-        middlewares: list,
+        middlewares: Sequence[MiddlewareHandler],
     ):
+        route = self._append_route(handler, name, path, middlewares)
+        self._index_route(route)
+        self._invalidate_caches()
+
+    def add_prebuilt(self, route: Route):
+        """
+        Register a Route built by another router as is, without building it
+        again. Its path is used unchanged, so it must already be normalized
+        and contain this router's prefix.
+        """
+        prefix = self._create_url_path(self.prefix)
+        if route.path != self._create_url_path(route.path) or not (
+            prefix == "/" or route.path == prefix or route.path.startswith(prefix + "/")
+        ):
+            raise ValueError(
+                f"Route path {route.path} is not a normalized path under {prefix}"
+            )
+        self._add_built(route)
+        self._invalidate_caches()
+
+    def _add_built(self, route: Route):
+        self.routes.append(route)
+        self._index_route(route)
+
+    def _append_route(
+        self,
+        handler: RouteHandler,
+        name: Union[str, Enum],
+        path: str,
+        middlewares: Sequence[MiddlewareHandler],
+    ) -> Route:
         path = self._create_url_path(self.prefix, path)
         route = Route(
             handler=handler,
@@ -238,6 +658,93 @@ class Router:
             middlewares=middlewares,
         )
         self.routes.append(route)
+        return route
+
+    def _index_route(self, route: Route):
+        self._route_order.setdefault(route, len(self._route_order))
+        self._insert_route(route)
+        if route.is_static and not self._is_shadowed(route):
+            self._static.setdefault(route.path, route)
+        self._by_name.setdefault(route.name, route)
+
+    def _is_shadowed(self, route: Route) -> bool:
+        # a route registered before it that matches its whole path wins, so
+        # the path can't be answered from the static map
+        if self._match_trie(route.path)[0] is not route:
+            return True
+        fallback_routes = self._fallback_routes.get(route.path.count("/"), ())
+        return any(fallback.match(route.path) for fallback in fallback_routes)
+
+    def _invalidate_caches(self):
+        self._resolve_cache.clear()
+        self._fallback_patterns.clear()
+
+    def _insert_route(self, route: Route):
+        if route._segments is None:
+            self._fallback_routes[route.path.count("/")].append(route)
+            return
+
+        order = self._route_order[route]
+        node = self._trie
+        node.min_order = min(node.min_order, order)
+        param_names = []
+        for is_param, value in route._segments:
+            if is_param:
+                if node.param is None:
+                    node.param = _TrieNode()
+                node = node.param
+                param_names.append(value)
+            else:
+                node = node.static.setdefault(value, _TrieNode())
+            node.min_order = min(node.min_order, order)
+
+        # the first registered route wins, as with the linear scan
+        if node.route is None:
+            node.route = route
+            node.param_names = tuple(param_names)
+            node.order = order
+
+    def _match_trie(self, path_only: str) -> Tuple[Optional[Route], dict]:
+        if not path_only.startswith("/"):
+            return None, {}
+
+        segments = path_only[1:].split("/")
+        depth = len(segments)
+        best: Optional[_TrieNode] = None
+        best_order = sys.maxsize
+        best_values: Tuple[str, ...] = ()
+        # branches still to search, with the param values captured on the way
+        pending: List[Tuple[_TrieNode, int, Tuple[str, ...]]] = [(self._trie, 0, ())]
+
+        while pending:
+            node, index, values = pending.pop()
+            # no route below was registered before the best match so far
+            if node.min_order >= best_order:
+                continue
+            if index == depth:
+                if node.order < best_order:
+                    best, best_order, best_values = node, node.order, values
+                continue
+
+            segment = segments[index]
+            child = node.static.get(segment)
+            param = node.param if segment else None
+            # the branch holding the earlier registered routes is popped first
+            if param is not None and (
+                child is None or param.min_order < child.min_order
+            ):
+                if child is not None:
+                    pending.append((child, index + 1, values))
+                pending.append((param, index + 1, values + (segment,)))
+            else:
+                if param is not None:
+                    pending.append((param, index + 1, values + (segment,)))
+                if child is not None:
+                    pending.append((child, index + 1, values))
+
+        if best is None:
+            return None, {}
+        return best.route, dict(zip(best.param_names, best_values))
 
     def route(
         self,
@@ -259,53 +766,154 @@ class Router:
         return decorator
 
     def include_router(self, router: "Router"):
+        parent = tuple(self.middlewares or ())
         for route in router.routes:
-            new_middlewares = []
-            if self.middlewares:
-                new_middlewares.extend(self.middlewares)
-            if route.middlewares:
-                new_middlewares.extend(route.middlewares)
-            self.add_route(
+            # routes without own middlewares share the parent tuple
+            middlewares = parent + route.middlewares if route.middlewares else parent
+            new_route = self._append_route(
                 handler=route.handler,
                 name=route.name,
                 path=route.path,
-                middlewares=new_middlewares,
+                middlewares=middlewares,
             )
+            self._index_route(new_route)
+        # indices are updated incrementally, caches only need one reset
+        self._invalidate_caches()
+
+    def _resolve(self, path: RoutePath) -> Tuple[Optional[Route], str, Optional[dict]]:
+        resolver = self._RESOLVERS.get(type(path))
+        if resolver is None:
+            # subclasses, e.g. str-based enums, take the slow path
+            if isinstance(path, Enum):
+                resolver = Router._resolve_enum
+            elif isinstance(path, dict):
+                resolver = Router._resolve_dict
+            elif isinstance(path, Location):
+                resolver = Router._resolve_location
+            elif isinstance(path, str):
+                resolver = Router._resolve_str
+            else:
+                return None, "", None
+        return resolver(self, path)
+
+    def _resolve_location(
+        self, path: Location
+    ) -> Tuple[Optional[Route], str, Optional[dict]]:
+        route = self._by_name.get(path.name)
+        if route is None:
+            return None, "", None
+        # a static route has no path params, nothing to extract later
+        path_str = route.build_path(path.params, path.query)
+        return route, path_str, {} if route.is_static else None
 
-    def _resolve(self, path: RoutePath) -> Tuple[Optional[Route], str]:
-        if isinstance(path, Enum):
-            path = Location(name=path)
-        if isinstance(path, dict):
-            path = Location(**path)
-        if isinstance(path, Location):
-            for route in self.routes:
-                if route.name == path.name:
-                    return route, path.build_path(route.path)
-        if isinstance(path, str):
-            for route in self.routes:
-                if route.match(path):
-                    return route, path
-        return None, ""
+    def _resolve_dict(self, path: dict) -> Tuple[Optional[Route], str, Optional[dict]]:
+        return self._resolve_location(Location(**path))
+
+    def _resolve_enum(self, path: Enum) -> Tuple[Optional[Route], str, Optional[dict]]:
+        # a bare name has no params or query, the route path is the target
+        route = self._by_name.get(path)
+        if route is None:
+            return None, "", None
+        return route, route.path, {} if route.is_static else None
+
+    def _resolve_str(self, path: str) -> Tuple[Optional[Route], str, Optional[dict]]:
+        cached = self._resolve_cache.get(path)
+        if cached is not None:
+            self._resolve_cache.move_to_end(path)
+            route, resolved_path, path_params = cached
+            # hand out a copy so the cached params can't be mutated
+            return route, resolved_path, _copy_params(path_params)
+        resolved = self._lookup_str(path)
+        # misses are not cached so unknown urls can't fill the cache
+        route, resolved_path, path_params = resolved
+        if route is not None:
+            self._resolve_cache[path] = (
+                route,
+                resolved_path,
+                _copy_params(path_params),
+            )
+            if len(self._resolve_cache) > self._RESOLVE_CACHE_MAX:
+                self._resolve_cache.popitem(last=False)
+        return resolved
+
+    def _lookup_str(self, path: str) -> Tuple[Optional[Route], str, Optional[dict]]:
+        path_only, _ = _split_path(path)
+        route = self._static.get(path_only)
+        if route is not None:
+            return route, path, {}
+        route, path_params = self._match_trie(path_only)
+        fallback, fallback_params = self._match_fallback(path_only)
+        # both can match, e.g. "/f/{id}" and "/f/{name}.txt", the earlier wins
+        if fallback is not None and (
+            route is None or self._route_order[fallback] < self._route_order[route]
+        ):
+            route, path_params = fallback, fallback_params
+        if route is not None:
+            return route, path, path_params
+        return None, "", None
+
+    def _match_fallback(self, path_only: str) -> Tuple[Optional[Route], dict]:
+        # placeholders never span a "/", so only routes with the same number
+        # of segments as the path can match it
+        bucket = path_only.count("/")
+        routes = self._fallback_routes.get(bucket)
+        if not routes:
+            return None, {}
+
+        compiled = self._fallback_patterns.get(bucket)
+        if compiled is None:
+            compiled = self._compile_fallback(routes)
+            self._fallback_patterns[bucket] = compiled
+        match_fallback, route_groups = compiled
+
+        match = match_fallback(path_only)
+        if match is None:
+            return None, {}
+
+        route, groups = route_groups[cast(str, match.lastgroup)]
+        return route, {name: match.group(group) for name, group in groups}
+
+    def _compile_fallback(
+        self, routes: List[Route]
+    ) -> Tuple[_MatchFunc, _FallbackGroups]:
+        """
+        Pack regex-only routes into one alternation, so a lookup is a single
+        match call. Param groups are prefixed per route to keep their names
+        unique, and the first registered route still wins.
+        """
+        alternatives = []
+        route_groups: _FallbackGroups = {}
+        for index, route in enumerate(routes):
+            route_group = f"r{index}"
+            groups = []
+
+            def param_group(name: str) -> str:
+                group = f"{route_group}_{len(groups)}"
+                groups.append((name, group))
+                return group
+
+            pattern = _path_regex(route.path, param_group)
+            alternatives.append(f"(?P<{route_group}>{pattern})")
+            route_groups[route_group] = (route, tuple(groups))
+
+        pattern = re.compile("^(?:" + "|".join(alternatives) + ")$")
+        return pattern.match, route_groups
+
+    _RESOLVERS: Dict[
+        type, Callable[..., Tuple[Optional[Route], str, Optional[dict]]]
+    ] = {
+        str: _resolve_str,
+        dict: _resolve_dict,
+        Location: _resolve_location,
+    }
 
     async def _process_middleware(
         self,
         to_route: Route,
         from_route: Optional[Route],
-        middleware_handler: MiddlewareHandler,
+        middleware_handler: "_MiddlewareCall",
     ):
-        handler_params = inspect.signature(middleware_handler).parameters
-
-        kwargs = {}
-        if "to_route" in handler_params:
-            kwargs["to_route"] = to_route
-        if "from_route" in handler_params:
-            kwargs["from_route"] = from_route
-        if "router" in handler_params:
-            kwargs["router"] = self
-        if "page" in handler_params:
-            kwargs["page"] = self.page
-
-        result = await middleware_handler(**kwargs)
+        result = await middleware_handler(to_route, from_route, self, self.page)
 
         if result is None or result is True:
             return True
@@ -323,10 +931,22 @@ class Router:
         if self.page is None:
             raise ValueError("Router is not mounted to a page")
 
-        route, path = self._resolve(path)
+        route, path, path_params = self._resolve(path)
+        await self._navigate(route, path, path_params, replace)
+
+    async def _navigate(
+        self,
+        route: Optional[Route],
+        path: str,
+        path_params: Optional[dict] = None,
+        replace: bool = False,
+        run_middlewares: bool = True,
+    ):
+        if self.page is None:
+            raise ValueError("Router is not mounted to a page")
 
-        if route and route.middlewares:
-            for middleware in route.middlewares:
+        if run_middlewares and route is not None and route.has_middleware:
+            for middleware in route._middlewares:
                 result = await self._process_middleware(
                     to_route=route,
                     from_route=self.current_route,
@@ -336,39 +956,49 @@ class Router:
                     return
 
         if self.current_route:
+            # the leaving route gets its own params, captured when it was entered
             await self.current_route.before_leave(
-                path,
+                cast(str, self.current_path),
                 self.page,
                 self,
+                self._current_params,
             )
 
+        prev_route = self.current_route
         self.current_route = route
 
         if route is None:
-            view = ft.View(
-                bgcolor=f"{self.page.bgcolor}",
-            )
+            view = self._not_found_view_factory(self.page)
         else:
-            await route.before_enter(
-                path,
-                self.page,
-                self,
-            )
-            view = await route.view(
-                path,
-                self.page,
-                self,
-            )
+            params = route.extract_params(path, path_params)
+            view = await route._enter(params, self.page, self)
 
         if replace and self.page.views:
             self.page.views.pop()
         if not replace:
-            self.history.append(str(self.page.route))
+            prev_path = self.current_path
+            if prev_path is None:
+                prev_path = str(self.page.route)
+            self.history.append((prev_route, prev_path, self._current_params))
 
         self.current_path = path
+        self._current_params = path_params
         self.page.route = path
         self.page.views.append(view)
-        self.page.update()
+        self._schedule_update()
+
+    def _schedule_update(self):
+        # navigations finishing in the same loop tick share one page update
+        if self._update_pending:
+            return
+        self._update_pending = True
+        cast(ft.Page, self.page).run_task(self._flush_update)
+
+    async def _flush_update(self):
+        await asyncio.sleep(0)
+        self._update_pending = False
+        if self.page is not None:
+            self.page.update()
 
     def go_push(self, path: RoutePath):
         """
@@ -413,13 +1043,25 @@ class Router:
             return
 
         self.page.views.pop()
-        prev_path = self.history.pop()
+        prev_route, prev_path, prev_params = self.history.pop()
         self.page.route = prev_path
 
+        if prev_route is None:
+            self.page.run_task(
+                self._go_task,
+                prev_path,
+                True,
+            )
+            return
+
+        # the route and its params are already known, skip resolving again
         self.page.run_task(
-            self._go_task,
+            self._navigate,
+            prev_route,
             prev_path,
+            prev_params,
             True,
+            self.back_middlewares,
         )
 
     def _render(
@@ -444,12 +1086,21 @@ class Router:
         router = cls(page=page)
 
         for route in routes:
-            router.add_route(
-                handler=route.handler,
-                name=route.name,
-                path=route.path,
-                middlewares=route.middlewares,
-            )
+            # the mounted router has no prefix, a built route with a normalized
+            # path is reused as is and only the indices are updated
+            if isinstance(route, Route) and route.path == router._create_url_path(
+                route.path
+            ):
+                router._add_built(route)
+            else:
+                # anything else carrying the route fields is built again
+                router.add_route(
+                    handler=route.handler,
+                    name=route.name,
+                    path=route.path,
+                    middlewares=route.middlewares,
+                )
+        router._invalidate_caches()
 
         router._render(default_path or page.route)
 